@@ -37,10 +37,8 @@ Example:
     print(sample_set)
     print()
 
-    gains = []
-    for attr in sample_set.attributes:
-        gains.append([attr.name, sample_set.gain(attr.name)])
-    print(tabulate(gains, headers=['attribute', 'gain']))
+    gains = sample_set.gains()
+    print(tabulate(gains.items(), headers=['attribute', 'gain']))
 
 Output:
       #  outlook    temp    humidity    wind    class
@@ -68,10 +66,27 @@ Output:
     wind         0.048127
 
 """
-from math import log2
+from concurrent.futures import ThreadPoolExecutor
+from math import log, log2
+from operator import attrgetter, itemgetter
 
 from tabulate import tabulate
 
+try:
+    import numpy as np
+except ImportError:  # fall back to pure Python counting
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # gain uses the NumPy histogram instead
+    njit = None
+
+_INV_LN2 = 1.0 / log(2.0)  # log2(x) == log(x) * _INV_LN2
+
+# samples times attributes above which SampleSet.gains uses a thread pool
+_PARALLEL_GAINS_MIN = 8_000_000
+
 
 def info_function(values):
     """
@@ -82,20 +97,118 @@ def info_function(values):
     :param values: List of occurrences of each value.
     :return: The result of the information function.
     """
+    if np is not None:
+        p = np.asarray(values, dtype=np.float64)
+        total = p.sum()
+        if total == 0:
+            raise ZeroDivisionError('info_function of values that sum to zero')
+        # 0.0 - x rather than -x so pure values give 0.0, not -0.0
+        return float(0.0 - _xlog2x(p / total).sum())
+
     total = sum(values)
     fracs = [value / total for value in values]
     i = 0
     for frac in fracs:
         if frac != 0:
-            i -= frac * log2(frac)
+            i -= frac * log(frac) * _INV_LN2
     return i
 
 
+def _xlog2x(p):
+    """
+    Calculates p*log2(p) element-wise, defined as 0 where p is 0, without
+    branching on each term.
+
+    :param p: numpy array of probabilities.
+    :return: numpy array of p*log2(p).
+    """
+    return p * np.log2(np.where(p > 0, p, 1))
+
+
+def _counts_entropy(counts) -> float:
+    """
+    Calculates the entropy of an array of class counts.
+
+    :param counts: List or numpy array of occurrences of each class.
+    :return: The entropy of the counts (0 if there are no occurrences).
+    """
+    if np is None:
+        return info_function(counts) if sum(counts) else 0.0
+    total = counts.sum()
+    if total == 0:
+        return 0.0
+    return float(0.0 - _xlog2x(counts / total).sum())
+
+
+def _binary_entropy(counts) -> float:
+    """
+    Calculates the entropy of two class counts in closed form:
+    H(p) = -p*log2(p) - (1-p)*log2(1-p)
+
+    :param counts: List or numpy array with the occurrences of both classes.
+    :return: The entropy of the counts (0 if either class does not occur).
+    """
+    pos, neg = counts[0], counts[1]
+    if pos == 0 or neg == 0:
+        return 0.0
+    p = pos / (pos + neg)
+    q = neg / (pos + neg)  # not 1 - p, which loses precision as p nears 1
+    return float(-(p * log(p) + q * log(q)) * _INV_LN2)
+
+
+def _row_entropies(h):
+    """
+    Calculates the entropy of each row of a 2D array of class counts.
+
+    :param h: numpy array where h[v, k] is the number of occurrences of class k
+        for value v.
+    :return: Array with the entropy of each row (0 for empty rows).
+    """
+    rows = h.sum(1)
+    p = h / np.maximum(rows, 1)[:, None]
+    return 0.0 - _xlog2x(p).sum(1)
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _joint_entropy(values_col, results, n_values, n_classes):
+        """
+        Calculates the entropy of the samples remaining after splitting on an
+        attribute: S ((|Sv| / |S|) * Entropy(Sv)).
+
+        :param values_col: Value index of the attribute for each sample
+        :param results: Class index of each sample
+        :param n_values: Number of values of the attribute
+        :param n_classes: Number of classes
+        :return: The weighted entropy of the values
+        """
+        h = np.zeros((n_values, n_classes), np.int64)
+        for n in range(values_col.size):
+            h[values_col[n], results[n]] += 1
+
+        total = values_col.size
+        entropy = 0.0
+        for v in range(n_values):
+            row = 0
+            for k in range(n_classes):
+                row += h[v, k]
+            for k in range(n_classes):
+                c = h[v, k]
+                if c > 0:
+                    frac = c / row
+                    entropy -= (row / total) * frac * log2(frac)
+        return entropy
+else:
+    _joint_entropy = None
+
+
 class Attribute:
     """
     Represents a possible feature in a SampleSet.
     """
 
+    __slots__ = ('name', 'values')
+
     def __init__(self, name, values):
         self.name = name
         self.values = values
@@ -112,6 +225,8 @@ class Sample:
     :values: The input that yields the result
     """
 
+    __slots__ = ('result', 'values')
+
     def __init__(self, result, values):
         self.result = result
         self.values = values
@@ -121,16 +236,124 @@ class SampleSet:
     """
     :attributes: Tuple of Attributes
     :classes: Tuple of possible classes as sample could be a part of. ex: (yes, no)
-    :samples: List of Samples
+    :samples: Tuple of Samples (read-only, use add_sample to add one)
     """
 
-    def __init__(self, attributes, classes, samples=list()):
+    __slots__ = ('attributes', 'classes', '_samples', '_attr_index',
+                 '_entropy_cache', '_dirty', '_val2idx', '_cls_idx', '_n',
+                 '_value_cols', '_result_codes', '_dtype', '_values',
+                 '_results', '_entropy_fn')
+
+    def __init__(self, attributes, classes, samples=None):
         self.attributes = attributes
         self.classes = classes
-        self.samples = samples
+        self._samples = list(samples) if samples is not None else []
+        self._attr_index = {a.name: i for i, a in enumerate(attributes)}
+        self._entropy_cache = None
+        self._dirty = True
+        if len(classes) == 2:
+            self._entropy_fn = _binary_entropy
+        else:
+            self._entropy_fn = _counts_entropy
+        self._encode()
+
+    def _encode(self):
+        """
+        Builds the value/class to index maps and encodes the samples as
+        integer arrays: _values[n, a] is the index of the value of attribute
+        a for sample n and _results[n] is the index of its class. Without
+        NumPy, the same indexes are kept column by column in lists:
+        _value_cols[a][n] and _result_codes[n].
+        """
+        self._val2idx = [{v: i for i, v in enumerate(a.values)}
+                         for a in self.attributes]
+        self._cls_idx = {c: i for i, c in enumerate(self.classes)}
+
+        # encode column by column
+        values = list(map(attrgetter('values'), self._samples))
+        valid = all(len(v) == len(self.attributes) for v in values)
+        if valid:
+            try:
+                cols = [list(map(vi.__getitem__, map(itemgetter(i), values)))
+                        for i, vi in enumerate(self._val2idx)]
+                results = list(map(self._cls_idx.__getitem__,
+                                   map(attrgetter('result'), self._samples)))
+            except KeyError:
+                valid = False
+        if not valid:
+            # encode sample by sample to raise a ValueError naming the bad one
+            for sample in self._samples:
+                self._sample_codes(sample)
+
+        self._n = len(self._samples)
+        if np is None:
+            self._value_cols = cols
+            self._result_codes = results
+        else:
+            max_values = max([len(a.values) for a in self.attributes]
+                             + [len(self.classes), 1])
+            self._dtype = np.min_scalar_type(max_values - 1)
+            # one column per row of cols, so _values[:, a] is contiguous
+            self._values = np.array(cols, dtype=self._dtype).reshape(
+                len(self.attributes), self._n).T
+            self._results = np.array(results, dtype=self._dtype)
+
+    def _sample_codes(self, sample):
+        """
+        Encodes a sample.
+
+        :param sample: The sample to encode
+        :return: Tuple of the value indexes and the class index of the sample
+        """
+        if len(sample.values) != len(self.attributes):
+            raise ValueError("Sample has %d values but there are %d attributes."
+                             % (len(sample.values), len(self.attributes)))
+        try:
+            codes = [vi[v] for vi, v in zip(self._val2idx, sample.values)]
+        except KeyError:
+            # find the undeclared value to name it in the error
+            codes = [self._value_code(i, v) for i, v in enumerate(sample.values)]
+        try:
+            result = self._cls_idx[sample.result]
+        except KeyError:
+            raise ValueError("'%s' is not a class." % sample.result) from None
+        return codes, result
+
+    def _encode_sample(self, sample):
+        """
+        Appends the encoded sample to the arrays, doubling them when full.
+        Nothing is appended if the sample has an undeclared value or class.
+        """
+        codes, result = self._sample_codes(sample)
+        if np is None:
+            for col, code in zip(self._value_cols, codes):
+                col.append(code)
+            self._result_codes.append(result)
+        else:
+            if self._n == len(self._results):
+                capacity = max(2 * self._n, 16)
+                values = np.zeros((capacity, len(self.attributes)),
+                                  dtype=self._dtype, order='F')
+                values[:self._n] = self._values
+                results = np.zeros(capacity, dtype=self._dtype)
+                results[:self._n] = self._results
+                self._values, self._results = values, results
+            self._values[self._n] = codes
+            self._results[self._n] = result
+        self._n += 1
+
+    @property
+    def samples(self):
+        """
+        The samples of the set. This is a copy, so that every sample is added
+        through add_sample and counted in the encoded arrays.
+        """
+        return tuple(self._samples)
 
     def add_sample(self, sample):
-        self.samples.append(sample)
+        self._encode_sample(sample)
+        self._samples.append(sample)
+        self._dirty = True
 
     def entropy(self) -> float:
         """
@@ -138,23 +361,16 @@ class SampleSet:
 
         :return: The entropy of the data
         """
-        s = dict.fromkeys(self.classes, 0)
-        for x in self.samples:
-            s[x.result] += 1
-
-        entropy = 0
-        c = len(self.samples)  # cardinality of S
-        for _, v in s.items():
-            frac = v / c
-            if frac != 0:
-                entropy -= frac * log2(frac)
-        return entropy
+        if self._dirty:
+            self._entropy_cache = self._entropy_fn(self._class_counts())
+            self._dirty = False
+        return self._entropy_cache
 
     def attribute_entropy(self, attr, value) -> float:
         """
         Entropy(Sweak) = - (6/8)*log2(6/8) - (2/8)*log2(2/8) = 0.811
 
-        :param attr_index: Index of the attribute (ex: 'wind' => 3)
+        :param attr: Name or index of the attribute (ex: 'wind' or 3)
         :param value: Value of the attribute to be calculated (ex: 'weak')
         :return: The entropy of the value
         """
@@ -162,19 +378,42 @@ class SampleSet:
         if isinstance(attr, str):
             attr_index = self.index_of_attribute(attr)
 
-        c = 0  # number of samples that match feature
-        s = dict.fromkeys(self.classes, 0)  # result counter for feature
-        for x in self.samples:
-            if x.values[attr_index] == value:
-                c += 1
-                s[x.result] += 1
-
-        entropy = 0
-        for _, v in s.items():
-            frac = v / c
-            if frac != 0:
-                entropy -= frac * log2(frac)
-        return entropy
+        return self._entropy_fn(self._value_counts(attr_index, value))
+
+    def _class_counts(self):
+        """
+        Counts the samples of each class.
+
+        :return: Counts indexed by class index
+        """
+        if np is not None:
+            return np.bincount(self._results[:self._n],
+                               minlength=len(self.classes))
+
+        s = [0] * len(self.classes)
+        for r in self._result_codes:
+            s[r] += 1
+        return s
+
+    def _value_counts(self, attr_index, value):
+        """
+        Counts the samples of each class that have the given value.
+
+        :param attr_index: Index of the attribute
+        :param value: Value of the attribute
+        :return: Counts indexed by class index
+        """
+        code = self._value_code(attr_index, value)
+        if np is not None:
+            mask = self._values[:self._n, attr_index] == code
+            return np.bincount(self._results[:self._n][mask],
+                               minlength=len(self.classes))
+
+        s = [0] * len(self.classes)
+        for v, r in zip(self._value_cols[attr_index], self._result_codes):
+            if v == code:
+                s[r] += 1
+        return s
 
     def attribute_gain(self, attr1, value, attr2):
         """
@@ -186,33 +425,40 @@ class SampleSet:
         """
         attr1_index = self.index_of_attribute(attr1)
         attr2_index = self.index_of_attribute(attr2)
-        # initialize gain with entropy of attr1
-        gain = self.attribute_entropy(attr1_index, value)
-
-        # get samples that match attr1.value
-        samples = [x for x in self.samples if x.values[attr1_index] == value]
-
-        # split samples into categories by their value for attr2
-        cats = dict.fromkeys(self.attributes[attr2_index].values, [])
-        for s in samples:
-            cats[s.values[attr2_index]].append(s)
-
-        # split samples by results
-        results = {}
-        for k, l in cats.items():
-            s = dict.fromkeys(self.classes, 0)
-            for sample in l:
-                if sample.values[attr2_index] == k:
-                    s[sample.result] += 1
-            results[k] = s
-
-        n = len(samples)
-        for _, x in results.items():
-            l = []
-            for _, c in x.items():
-                l.append(c)
-            gain -= (sum(l) / n) * info_function(l)
-        return gain
+        code = self._value_code(attr1_index, value)
+
+        if np is None:
+            # count classes for each value of attr2 among samples that
+            # match attr1.value
+            s = [[0] * len(self.classes)
+                 for _ in self.attributes[attr2_index].values]
+            for v1, v2, r in zip(self._value_cols[attr1_index],
+                                 self._value_cols[attr2_index],
+                                 self._result_codes):
+                if v1 == code:
+                    s[v2][r] += 1
+            rows = [sum(l) for l in s]
+            n = sum(rows)
+            if n == 0:
+                return 0.0
+
+            # initialize gain with entropy of attr1.value
+            gain = self._entropy_fn([sum(c) for c in zip(*s)])
+            for l, c in zip(s, rows):
+                if c:
+                    gain -= (c / n) * self._entropy_fn(l)
+            return gain
+
+        mask = self._values[:self._n, attr1_index] == code
+        h = self._joint_counts(attr2_index, mask)
+        rows = h.sum(1)
+        n = rows.sum()
+        if n == 0:
+            return 0.0
+        # entropy of every value of attr2 and of attr1.value with one log2 call
+        entropies = _row_entropies(np.vstack((h, h.sum(0))))
+        gain = entropies[-1] - (rows / n * entropies[:-1]).sum()
+        return float(gain)
 
     def gain(self, attribute) -> float:
         """
@@ -222,30 +468,105 @@ class SampleSet:
         :param attribute: The attribute to compute the gain
         :return: The gain the for the given attribute
         """
-        gain = self.entropy()
         i = self.index_of_attribute(attribute)
+        if np is None:
+            # count classes for each feature in a single pass
+            buckets = [[0] * len(self.classes) for _ in self.attributes[i].values]
+            for v, r in zip(self._value_cols[i], self._result_codes):
+                buckets[v][r] += 1
+
+            gain = self.entropy()
+            total = self._n
+            for bucket in buckets:
+                n = sum(bucket)
+                if n:
+                    gain -= (n / total) * self._entropy_fn(bucket)
+            return gain
+
+        if _joint_entropy is not None:
+            weighted = _joint_entropy(self._values[:self._n, i],
+                                      self._results[:self._n],
+                                      len(self.attributes[i].values),
+                                      len(self.classes))
+            return float(self.entropy() - weighted)
+
+        h = self._joint_counts(i)
+
+        # weight each value's entropy by its share of the samples
+        rows = h.sum(1)
+        total = rows.sum()
+        if total == 0:
+            return 0.0
+        gain = self.entropy() - (rows / total * _row_entropies(h)).sum()
+        return float(gain)
+
+    def gains(self, names=None, executor=None):
+        """
+        Computes the gain of several attributes. The gains run serially unless
+        an executor is given, or the Numba kernel (which releases the GIL) is
+        available and there are at least _PARALLEL_GAINS_MIN samples times
+        attributes, below which starting a thread pool costs more than it saves.
+
+        :param names: Names of the attributes (default: all attributes)
+        :param executor: Optional concurrent.futures.Executor to map gain over
+        :return: dict of attribute name to gain
+        """
+        if names is None:
+            names = [a.name for a in self.attributes]
+        names = list(names)
+        self.entropy()  # fill the cache before the threads read it
+
+        if executor is not None:
+            return dict(zip(names, executor.map(self.gain, names)))
+        if _joint_entropy is None or self._n * len(names) < _PARALLEL_GAINS_MIN:
+            return {name: self.gain(name) for name in names}
+        with ThreadPoolExecutor() as ex:
+            return dict(zip(names, ex.map(self.gain, names)))
+
+    def _joint_counts(self, attr_index, mask=None):
+        """
+        Counts the samples for every (value, class) pair of an attribute in
+        a single pass.
 
-        # count number of occurrences for each feature
-        s = dict.fromkeys(self.attributes[i].values, 0)
-        for x in self.samples:
-            s[x.values[i]] += 1
-
-        c = len(self.samples)
-        for k, v in s.items():
-            frac = v / c
-            gain -= frac * self.attribute_entropy(i, k)
-        return gain
+        :param attr_index: Index of the attribute
+        :param mask: Optional boolean array selecting the samples to count
+        :return: int64 array H where H[v, k] is the number of samples with
+            value v for the attribute and class k
+        """
+        n_values = len(self.attributes[attr_index].values)
+        n_classes = len(self.classes)
+        values = self._values[:self._n, attr_index]
+        results = self._results[:self._n]
+        if mask is not None:
+            values = values[mask]
+            results = results[mask]
+        keys = values.astype(np.intp) * n_classes + results
+        h = np.bincount(keys, minlength=n_values * n_classes)
+        return h.reshape(n_values, n_classes)
 
     def index_of_attribute(self, attribute):
         """
-        Finds the index of the attribute since it is a tuple and not a dict
+        Finds the index of the attribute by name
         :param name: The name of the attribute to look for
         :return: The index of the attribute.
         """
-        for i, x in enumerate(self.attributes):
-            if x.name == attribute:
-                return i
-        raise Exception("'%s' is not an attribute." % attribute)
+        try:
+            return self._attr_index[attribute]
+        except KeyError:
+            raise ValueError("'%s' is not an attribute." % attribute) from None
+
+    def _value_code(self, attr_index, value):
+        """
+        Finds the index of a value of an attribute
+        :param attr_index: Index of the attribute
+        :param value: The value to look for
+        :return: The index of the value.
+        """
+        try:
+            return self._val2idx[attr_index][value]
+        except KeyError:
+            raise ValueError("'%s' is not a value of attribute '%s'."
+                             % (value, self.attributes[attr_index].name)) from None
 
     def __str__(self):
         # generate headers
@@ -254,7 +575,7 @@ class SampleSet:
         # generate table
         table = []
         i = 0
-        for s in self.samples:
+        for s in self._samples:
             i += 1
             row = [i] + list(s.values) + [s.result]
             table.append(row)
@@ -0,0 +1,80 @@
+import importlib
+import sys
+import textwrap
+from unittest import mock
+
+import pytest
+
+# modules to block so that ai.entropy falls back to each gain kernel
+KERNELS = {
+    'numba': {},
+    'numpy': {'numba': None},
+    'python': {'numba': None, 'numpy': None},
+}
+
+
+@pytest.fixture(params=sorted(KERNELS))
+def entropy(request):
+    """
+    ai.entropy imported fresh with the modules of the faster kernels blocked.
+    """
+    blocked = KERNELS[request.param]
+    for name in ('numpy', 'numba'):
+        if name not in blocked:
+            pytest.importorskip(name)
+    with mock.patch.dict(sys.modules, blocked):
+        sys.modules.pop('ai.entropy', None)
+        module = importlib.import_module('ai.entropy')
+    assert (module.np is None) == ('numpy' in blocked)
+    assert (module._joint_entropy is None) == ('numba' in blocked)
+    return module
+
+
+def test_default_samples_not_shared(entropy):
+    wind = entropy.Attribute('wind', ('weak', 'strong'))
+    a = entropy.SampleSet((wind,), ('yes', 'no'))
+    b = entropy.SampleSet((wind,), ('yes', 'no'))
+    a.add_sample(entropy.Sample('yes', ('weak',)))
+    a.add_sample(entropy.Sample('no', ('strong',)))
+
+    assert len(a.samples) == 2
+    assert len(b.samples) == 0
+    assert a.entropy() == 1.0
+    assert b.entropy() == 0.0
+
+
+def example_sample_set(entropy):
+    """
+    The sample set from the module docstring example.
+    """
+    namespace = dict(vars(entropy))
+    example = entropy.__doc__.split('Example:')[1].split('print(')[0]
+    exec(textwrap.dedent(example), namespace)
+    return namespace['sample_set']
+
+
+def test_example_output(entropy):
+    sample_set = example_sample_set(entropy)
+    gains = sample_set.gains()
+    printed = '%s\n\n%s' % (sample_set, entropy.tabulate(
+        gains.items(), headers=['attribute', 'gain']))
+
+    documented = entropy.__doc__.split('Output:\n')[1]
+    expected = textwrap.dedent(documented).strip('\n')
+    assert printed == expected
+    assert gains == {a.name: sample_set.gain(a.name)
+                     for a in sample_set.attributes}
+
+
+@pytest.mark.parametrize('attr1, value, attr2, expected', [
+    ('outlook', 'sunny', 'humidity', 0.970951),
+    ('outlook', 'sunny', 'temp', 0.570951),
+    ('outlook', 'sunny', 'wind', 0.019973),
+    # no rainy sample is hot, which used to divide by zero
+    ('outlook', 'rain', 'temp', 0.019973),
+    ('outlook', 'overcast', 'wind', 0.0),
+])
+def test_attribute_gain(entropy, attr1, value, attr2, expected):
+    sample_set = example_sample_set(entropy)
+    gain = sample_set.attribute_gain(attr1, value, attr2)
+    assert gain == pytest.approx(expected, abs=1e-6)